@@ -6,13 +6,22 @@ An MCP server that provides tools for querying AWS Athena tables.
 Requires AWS SSO authentication: aws sso login --profile voodoo-adn-prod
 """
 
+import asyncio
+import inspect
 import json
 import os
+import re
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from typing import Any
 from uuid import uuid4
 
 import boto3
 import awswrangler as wr
+from botocore.config import Config
+from botocore.exceptions import TokenRetrievalError, UnauthorizedSSOTokenError
 import pandas as pd
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -30,6 +39,29 @@ S3_OUTPUT_BUCKET = os.environ.get(
     "ATHENA_S3_OUTPUT",
     "s3://voodoo-adn-lakehouse-sandbox-20240913130058669800000001/athena-mcp"
 )
+# Use Athena UNLOAD to Parquet for query results (set to 0 if you lack
+# s3:PutObject on the output prefix to fall back to regular CSV results)
+ATHENA_UNLOAD = os.environ.get("ATHENA_UNLOAD", "1") == "1"
+# Let Athena reuse results of an identical regular (non-UNLOAD) query run within
+# this many minutes instead of scanning again (0 disables)
+RESULT_REUSE_MINUTES = int(os.environ.get("ATHENA_RESULT_REUSE_MINUTES", "60"))
+# Approximate token budget for a rendered result table (~4 characters per token)
+MAX_OUTPUT_TOKENS = int(os.environ.get("ATHENA_MAX_OUTPUT_TOKENS", "20000"))
+CHARS_PER_TOKEN = 4
+# Result downloads are network-bound, so oversubscribe threads relative to cores
+S3_DOWNLOAD_THREADS = min(32, (os.cpu_count() or 1) * 4)
+
+# Queries that can take an extra trailing LIMIT, and queries that already end in one
+_SELECT_QUERY = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_TRAILING_LIMIT = re.compile(
+    r"\b(LIMIT\s+(\d+|ALL)|FETCH\s+(FIRST|NEXT)\b[^;]*)\s*;?\s*$", re.IGNORECASE
+)
+# Athena errors for SELECTs that are valid but cannot be written out by UNLOAD
+_UNLOAD_UNSUPPORTED = re.compile(
+    r"NOT_SUPPORTED|\bUNLOAD\b|duplicate column|specified more than once"
+    r"|unknown type|type unknown|\bvoid\b|NULL type|timestamp with time zone",
+    re.IGNORECASE,
+)
 
 # =============================================================================
 # Server Setup
@@ -37,24 +69,278 @@ S3_OUTPUT_BUCKET = os.environ.get(
 
 server = Server("athena-mcp")
 
+# Shared by our clients and awswrangler's internal ones (including S3), so the
+# connection pool is large enough for parallel result downloads. This replaces
+# awswrangler's default config, so its timeout, retry count and user agent are
+# restated here
+BOTOCORE_CONFIG = Config(
+    max_pool_connections=50,
+    connect_timeout=10,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    user_agent_extra=f"awswrangler/{wr.__version__}",
+)
+wr.config.botocore_config = BOTOCORE_CONFIG
+
+# Athena result reuse needs an awswrangler that forwards it to StartQueryExecution
+_RESULT_REUSE = RESULT_REUSE_MINUTES > 0 and (
+    "result_reuse_configuration" in inspect.signature(wr.athena.read_sql_query).parameters
+)
+
+# All query output of this process lives under one prefix, so stragglers are
+# easy to find and a bucket lifecycle rule can expire them
+_SESSION_PREFIX = f"{S3_OUTPUT_BUCKET}/session-{uuid4()}"
+
+
+# boto3 sessions are not thread-safe, so each thread caches its own; bumping the
+# generation makes every thread rebuild its session on next use
+_THREAD_STATE = threading.local()
+_SESSION_GENERATION = 0
+
 
 def get_boto3_session() -> boto3.Session:
-    """Create a boto3 session with the configured AWS profile."""
-    return boto3.Session(profile_name=AWS_PROFILE_NAME, region_name=AWS_REGION_NAME)
+    """Return the calling thread's boto3 session for the configured AWS profile."""
+    if getattr(_THREAD_STATE, "generation", None) != _SESSION_GENERATION:
+        _THREAD_STATE.session = boto3.Session(
+            profile_name=AWS_PROFILE_NAME, region_name=AWS_REGION_NAME
+        )
+        _THREAD_STATE.generation = _SESSION_GENERATION
+    return _THREAD_STATE.session
+
+
+@lru_cache(maxsize=None)
+def get_boto3_client(service_name: str) -> Any:
+    """Return a cached boto3 client (clients, unlike sessions, are thread-safe).
+
+    Only call this from the event loop thread, so the session it builds the
+    client from is never shared with a worker thread.
+    """
+    return get_boto3_session().client(service_name, config=BOTOCORE_CONFIG)
+
+
+def reset_boto3_session() -> None:
+    """Drop the cached sessions and clients so the next call rebuilds them."""
+    global _SESSION_GENERATION
+    get_boto3_client.cache_clear()
+    _SESSION_GENERATION += 1
+
+
+def read_sql_query(
+    query: str,
+    database: str,
+    max_rows: int,
+    params: list[str] | None = None,
+    regular_query: str | None = None,
+) -> pd.DataFrame:
+    """Run a query through awswrangler, using UNLOAD to Parquet when enabled.
+
+    Results are streamed in chunks and only the first max_rows + 1 rows are
+    downloaded, so callers can tell whether the output was truncated without
+    paying for the rest of the result set.
+
+    params are bound server-side to the query's ? placeholders rather than
+    interpolated into the SQL text.
+
+    regular_query, if given, is run instead of query whenever UNLOAD is not
+    used, for queries that need different SQL for CSV results.
+
+    Meant to run in a worker thread; it uses that thread's own boto3 session.
+    """
+    session = get_boto3_session()
+
+    # UNLOAD only wraps a SELECT; SHOW, DESCRIBE, EXPLAIN and DDL statements
+    # go through the regular path
+    if ATHENA_UNLOAD and _SELECT_QUERY.match(query):
+        try:
+            return _run_query(query, database, session, max_rows, params, unload=True)
+        except wr.exceptions.QueryFailed as e:
+            # UNLOAD rejects some valid SELECTs (duplicate column names,
+            # NULL-typed columns, timestamp with time zone), so retry those
+            # without it; any other failure would only fail (and bill) twice
+            if not _UNLOAD_UNSUPPORTED.search(str(e)):
+                raise
+    return _run_query(regular_query or query, database, session, max_rows, params, unload=False)
+
+
+def _run_query(
+    query: str,
+    database: str,
+    session: boto3.Session,
+    max_rows: int,
+    params: list[str] | None,
+    unload: bool,
+) -> pd.DataFrame:
+    """Run a query once and return the first chunk of its results."""
+    extra_kwargs: dict[str, Any] = {"unload_approach": unload}
+    if params:
+        extra_kwargs.update(params=params, paramstyle="qmark")
+    if unload:
+        extra_kwargs["unload_parameters"] = {"file_format": "PARQUET", "compression": "snappy"}
+    # Athena cannot reuse UNLOAD results, only regular ones
+    reuse = _RESULT_REUSE and not unload
+    if reuse:
+        extra_kwargs["result_reuse_configuration"] = {
+            "ResultReuseByAgeConfiguration": {
+                "Enabled": True,
+                "MaxAgeInMinutes": RESULT_REUSE_MINUTES,
+            }
+        }
+
+    # UNLOAD requires an empty output prefix, hence a fresh subdirectory per query
+    s3_output = f"{_SESSION_PREFIX}/{uuid4().hex[:8]}"
+    df = None
+    try:
+        chunks = wr.athena.read_sql_query(
+            query,
+            boto3_session=session,
+            workgroup=WORKGROUP,
+            database=database,
+            ctas_approach=False,
+            s3_output=s3_output,
+            use_threads=S3_DOWNLOAD_THREADS,
+            chunksize=max_rows + 1,
+            **extra_kwargs,
+        )
+
+        # Stop after the first chunk; the remaining chunks are never fetched
+        chunk_iter = iter(chunks)
+        df = next(chunk_iter, None)
+        if hasattr(chunk_iter, "close"):
+            chunk_iter.close()
+    except wr.exceptions.EmptyDataFrame:
+        # Raised by the UNLOAD path when the query returns no rows
+        pass
+    finally:
+        # Reusable results have to stay in S3 for later queries to reuse them;
+        # the bucket lifecycle rule expires them instead
+        if not reuse:
+            delete_query_output(s3_output, df, session)
+
+    return df if df is not None else pd.DataFrame()
+
+
+def delete_query_output(s3_output: str, df: pd.DataFrame | None, session: boto3.Session) -> None:
+    """Remove the files a query left in S3.
+
+    awswrangler's keep_files=False only cleans up once a chunked result has
+    been read to the end, which never happens since we stop after one chunk.
+    """
+    try:
+        wr.s3.delete_objects(f"{s3_output}/", boto3_session=session)
+
+        # The workgroup may enforce its own output location for regular results
+        metadata = getattr(df, "query_metadata", None) or {}
+        output_location = metadata.get("ResultConfiguration", {}).get("OutputLocation")
+        if output_location and not output_location.startswith(f"{s3_output}/"):
+            wr.s3.delete_objects(
+                [output_location, f"{output_location}.metadata"], boto3_session=session
+            )
+    except Exception:
+        # Best effort: the bucket lifecycle rule expires anything left behind
+        pass
+
+
+def list_glue_names(glue: Any, operation: str, result_key: str, **kwargs: Any) -> list[str]:
+    """Collect the Name of every entry returned by a paginated Glue operation."""
+    return [
+        entry["Name"]
+        for page in glue.get_paginator(operation).paginate(**kwargs)
+        for entry in page[result_key]
+    ]
 
 
-def dataframe_to_markdown(df: pd.DataFrame, max_rows: int = 100) -> str:
-    """Convert a DataFrame to a markdown table string."""
+def to_json(value: Any) -> Any:
+    """Serialize a nested value (e.g. a struct read from Parquet) to JSON text."""
+    if value is None or isinstance(value, str):
+        return value
+    # Arrays inside structs come back from pyarrow as numpy arrays
+    return json.dumps(value, default=lambda v: v.tolist() if hasattr(v, "tolist") else str(v))
+
+
+def sql_string_literal(value: str) -> str:
+    """Quote a value as a SQL string literal for use as a query parameter."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def apply_row_limit(query: str, max_rows: int) -> str:
+    """Push a LIMIT into a SELECT query that does not already end with one.
+
+    The limit is max_rows + 1 so truncation can still be detected. It is
+    appended rather than wrapping the query in a subquery, since Trino drops
+    an ORDER BY inside a subquery that has no LIMIT of its own.
+    """
+    # Trailing comments are set aside so a LIMIT before them is still seen,
+    # and the new LIMIT goes before them rather than into them
+    end = _end_of_sql_code(query)
+    code, trailer = query[:end], query[end:]
+    if not _SELECT_QUERY.match(code) or _TRAILING_LIMIT.search(code):
+        return query
+    return f"{code.rstrip(';')}\nLIMIT {max_rows + 1}{trailer}"
+
+
+def _end_of_sql_code(query: str) -> int:
+    """Return the index just past the last character that is not a comment or whitespace."""
+    end = 0
+    i = 0
+    while i < len(query):
+        if query.startswith("--", i):
+            newline = query.find("\n", i)
+            i = len(query) if newline == -1 else newline
+        elif query.startswith("/*", i):
+            close = query.find("*/", i + 2)
+            i = len(query) if close == -1 else close + 2
+        elif query[i] in "'\"":
+            # String literal or quoted identifier; '' escapes read as two literals
+            close = query.find(query[i], i + 1)
+            i = end = len(query) if close == -1 else close + 1
+        else:
+            if not query[i].isspace():
+                end = i + 1
+            i += 1
+    return end
+
+
+def format_row_count(df: pd.DataFrame, max_rows: int) -> str:
+    """Describe how many rows a (possibly truncated) result contains."""
     if len(df) > max_rows:
-        df = df.head(max_rows)
+        return f"{max_rows}+ rows"
+    return f"{len(df)} rows"
+
+
+def dataframe_to_markdown(
+    df: pd.DataFrame, max_rows: int = 100, max_tokens: int = MAX_OUTPUT_TOKENS
+) -> str:
+    """Convert a DataFrame to a markdown table string.
+
+    The table is cut to at most max_rows rows, and further to the largest
+    number of rows whose rendering fits in roughly max_tokens tokens.
+    """
+    # An empty result without a schema has no header to render
+    if len(df.columns) == 0:
+        return "No rows returned."
+
+    truncated = len(df) > max_rows
+    df = df.head(max_rows)
+
+    # Build the table with vectorized string ops instead of tabulate
+    cells = df.astype(object).where(df.notna(), "").astype(str)
+    header = [
+        "| " + " | ".join(str(col) for col in df.columns) + " |",
+        "|" + "|".join("---" for _ in df.columns) + "|",
+    ]
+    rows = ("| " + cells.agg(" | ".join, axis=1) + " |").tolist() if len(cells) else []
+
+    # The rendered size of the first k rows is monotone in k, so the largest
+    # k that fits the budget is a binary search over the cumulative sizes
+    budget = max_tokens * CHARS_PER_TOKEN - sum(len(line) + 1 for line in header)
+    kept = bisect_right(list(accumulate(len(row) + 1 for row in rows)), budget)
+    if kept < len(rows):
+        rows = rows[:kept]
         truncated = True
-    else:
-        truncated = False
 
-    result = df.to_markdown(index=False)
+    result = "\n".join(header + rows)
 
     if truncated:
-        result += f"\n\n*Results truncated. Showing {max_rows} of {len(df)} rows.*"
+        result += f"\n\n*Results truncated. Showing the first {len(rows)} rows.*"
 
     return result
 
@@ -63,13 +349,11 @@ def dataframe_to_markdown(df: pd.DataFrame, max_rows: int = 100) -> str:
 # Tool Definitions
 # =============================================================================
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available Athena tools."""
-    return [
-        Tool(
-            name="athena_query",
-            description="""Execute a SQL query against AWS Athena.
+# Built once at import; clients re-request the tool list on every reconnect
+_TOOLS: list[Tool] = [
+    Tool(
+        name="athena_query",
+        description="""Execute a SQL query against AWS Athena.
 
 Use this to query data from Athena tables. The query should be valid Presto/Trino SQL.
 Results are returned as a markdown table.
@@ -80,123 +364,130 @@ Common tables:
 
 Tips:
 - Always include appropriate WHERE clauses to limit data scanned
-- Use LIMIT to restrict result set size
+- Use LIMIT to restrict result set size; SELECT queries without a final LIMIT
+  get one added automatically based on max_rows
 - server_timestamp is commonly used for time-based filtering""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "The SQL query to execute"
-                    },
-                    "database": {
-                        "type": "string",
-                        "description": f"The Athena database to query (default: {DEFAULT_DATABASE})",
-                        "default": DEFAULT_DATABASE
-                    },
-                    "max_rows": {
-                        "type": "integer",
-                        "description": "Maximum rows to return in output (default: 100)",
-                        "default": 100
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The SQL query to execute"
                 },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="athena_list_databases",
-            description="List all available databases in Athena.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="athena_list_tables",
-            description="List all tables in a specific Athena database.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "database": {
-                        "type": "string",
-                        "description": f"The database to list tables from (default: {DEFAULT_DATABASE})",
-                        "default": DEFAULT_DATABASE
-                    }
+                "database": {
+                    "type": "string",
+                    "description": f"The Athena database to query (default: {DEFAULT_DATABASE})",
+                    "default": DEFAULT_DATABASE
+                },
+                "max_rows": {
+                    "type": "integer",
+                    "description": "Maximum rows to return in output (default: 100)",
+                    "default": 100
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="athena_list_databases",
+        description="List all available databases in Athena.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="athena_list_tables",
+        description="List all tables in a specific Athena database.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": f"The database to list tables from (default: {DEFAULT_DATABASE})",
+                    "default": DEFAULT_DATABASE
                 }
             }
-        ),
-        Tool(
-            name="athena_describe_table",
-            description="Get the schema/structure of a specific Athena table.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table": {
-                        "type": "string",
-                        "description": "The table name to describe"
-                    },
-                    "database": {
-                        "type": "string",
-                        "description": f"The database containing the table (default: {DEFAULT_DATABASE})",
-                        "default": DEFAULT_DATABASE
-                    }
+        }
+    ),
+    Tool(
+        name="athena_describe_table",
+        description="Get the schema/structure of a specific Athena table.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table": {
+                    "type": "string",
+                    "description": "The table name to describe"
                 },
-                "required": ["table"]
-            }
-        ),
-        Tool(
-            name="athena_sample_query",
-            description="""Get sample data from bid_pricer_log table.
+                "database": {
+                    "type": "string",
+                    "description": f"The database containing the table (default: {DEFAULT_DATABASE})",
+                    "default": DEFAULT_DATABASE
+                }
+            },
+            "required": ["table"]
+        }
+    ),
+    Tool(
+        name="athena_sample_query",
+        description="""Get sample data from bid_pricer_log table.
 
 This is a convenience tool for quickly fetching auction log samples.
 Returns bid data including timestamps, countries, apps, bid amounts, and win probability curves.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_timestamp": {
-                        "type": "string",
-                        "description": "Start of time window in UTC (format: YYYY-MM-DD HH:MM:SS)"
-                    },
-                    "end_timestamp": {
-                        "type": "string",
-                        "description": "End of time window in UTC (format: YYYY-MM-DD HH:MM:SS)"
-                    },
-                    "country": {
-                        "type": "string",
-                        "description": "Optional: Filter by country code (e.g., 'US', 'FR')"
-                    },
-                    "app": {
-                        "type": "string",
-                        "description": "Optional: Filter by app name"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of records (default: 1000)",
-                        "default": 1000
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_timestamp": {
+                    "type": "string",
+                    "description": "Start of time window in UTC (format: YYYY-MM-DD HH:MM:SS)"
                 },
-                "required": ["start_timestamp", "end_timestamp"]
-            }
-        )
-    ]
+                "end_timestamp": {
+                    "type": "string",
+                    "description": "End of time window in UTC (format: YYYY-MM-DD HH:MM:SS)"
+                },
+                "country": {
+                    "type": "string",
+                    "description": "Optional: Filter by country code (e.g., 'US', 'FR')"
+                },
+                "app": {
+                    "type": "string",
+                    "description": "Optional: Filter by app name"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of records (default: 1000)",
+                    "default": 1000
+                }
+            },
+            "required": ["start_timestamp", "end_timestamp"]
+        }
+    )
+]
+
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available Athena tools."""
+    return _TOOLS
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
     try:
-        if name == "athena_query":
-            return await handle_athena_query(arguments)
-        elif name == "athena_list_databases":
-            return await handle_list_databases()
-        elif name == "athena_list_tables":
-            return await handle_list_tables(arguments)
-        elif name == "athena_describe_table":
-            return await handle_describe_table(arguments)
-        elif name == "athena_sample_query":
-            return await handle_sample_query(arguments)
-        else:
+        handler = _HANDLERS.get(name)
+        if handler is None:
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        return await handler(arguments)
+    except (TokenRetrievalError, UnauthorizedSSOTokenError) as e:
+        # SSO token expired: rebuild the session once the user logs in again
+        reset_boto3_session()
+        error_msg = (
+            f"AWS SSO token expired: {str(e)}\n"
+            f"Run: aws sso login --profile {AWS_PROFILE_NAME}"
+        )
+        return [TextContent(type="text", text=error_msg)]
     except Exception as e:
         error_msg = f"Error executing {name}: {str(e)}"
         return [TextContent(type="text", text=error_msg)]
@@ -208,74 +499,72 @@ async def handle_athena_query(arguments: dict[str, Any]) -> list[TextContent]:
     database = arguments.get("database", DEFAULT_DATABASE)
     max_rows = arguments.get("max_rows", 100)
 
-    session = get_boto3_session()
-
-    df = wr.athena.read_sql_query(
-        query,
-        boto3_session=session,
-        workgroup=WORKGROUP,
-        database=database,
-        ctas_approach=False,
-        unload_approach=False,
-        s3_output=f"{S3_OUTPUT_BUCKET}/{uuid4()}",
+    # awswrangler blocks while Athena runs, so keep it off the event loop
+    df = await asyncio.to_thread(
+        read_sql_query, apply_row_limit(query, max_rows), database, max_rows
     )
 
-    result = f"**Query Results** ({len(df)} rows)\n\n"
-    result += dataframe_to_markdown(df, max_rows=max_rows)
+    parts = [
+        f"**Query Results** ({format_row_count(df, max_rows)})\n\n",
+        dataframe_to_markdown(df, max_rows=max_rows),
+    ]
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
-async def handle_list_databases() -> list[TextContent]:
+async def handle_list_databases(arguments: dict[str, Any]) -> list[TextContent]:
     """List available Athena databases."""
-    session = get_boto3_session()
+    glue = get_boto3_client("glue")
 
-    databases = wr.catalog.databases(boto3_session=session)
+    # Query the Glue catalog directly; no DataFrame needed for a list of names
+    databases = await asyncio.to_thread(list_glue_names, glue, "get_databases", "DatabaseList")
 
-    result = "**Available Databases**\n\n"
-    for db in databases["Database"].tolist():
-        result += f"- {db}\n"
+    parts = ["**Available Databases**\n\n"]
+    parts.extend(f"- {db}\n" for db in databases)
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 async def handle_list_tables(arguments: dict[str, Any]) -> list[TextContent]:
     """List tables in a database."""
     database = arguments.get("database", DEFAULT_DATABASE)
-    session = get_boto3_session()
+    glue = get_boto3_client("glue")
 
-    tables = wr.catalog.tables(database=database, boto3_session=session)
+    tables = await asyncio.to_thread(
+        list_glue_names, glue, "get_tables", "TableList", DatabaseName=database
+    )
 
-    result = f"**Tables in {database}**\n\n"
+    parts = [f"**Tables in {database}**\n\n"]
     if len(tables) == 0:
-        result += "No tables found."
+        parts.append("No tables found.")
     else:
-        for _, row in tables.iterrows():
-            result += f"- {row['Table']}\n"
+        parts.extend(f"- {t}\n" for t in tables)
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 async def handle_describe_table(arguments: dict[str, Any]) -> list[TextContent]:
     """Describe a table's schema."""
     table = arguments["table"]
     database = arguments.get("database", DEFAULT_DATABASE)
-    session = get_boto3_session()
-
-    # Get table metadata
-    columns = wr.catalog.table(database=database, table=table, boto3_session=session)
+    glue = get_boto3_client("glue")
 
-    result = f"**Schema for {database}.{table}**\n\n"
-    result += "| Column | Type | Comment |\n"
-    result += "|--------|------|--------|\n"
+    # Get table metadata; partition keys are listed after the regular columns
+    response = await asyncio.to_thread(glue.get_table, DatabaseName=database, Name=table)
+    table_info = response["Table"]
+    columns = table_info["StorageDescriptor"]["Columns"] + table_info.get("PartitionKeys", [])
 
-    for _, row in columns.iterrows():
-        col_name = row.get("Column Name", row.get("Name", ""))
-        col_type = row.get("Type", "")
-        comment = row.get("Comment", "")
-        result += f"| {col_name} | {col_type} | {comment} |\n"
+    parts = [
+        f"**Schema for {database}.{table}**\n\n",
+        "| Column | Type | Comment |\n",
+        "|--------|------|--------|\n",
+    ]
+    parts.extend(
+        f"| {col['Name']} | {col.get('Type', '')} | {col.get('Comment', '')} |\n"
+        for col in columns
+    )
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 async def handle_sample_query(arguments: dict[str, Any]) -> list[TextContent]:
@@ -286,57 +575,78 @@ async def handle_sample_query(arguments: dict[str, Any]) -> list[TextContent]:
     app = arguments.get("app")
     limit = arguments.get("limit", 1000)
 
-    session = get_boto3_session()
-
-    # Build query with optional filters
+    # Build query with optional filters; values are bound as parameters so the
+    # SQL text only depends on which filters are set
     where_clauses = [
-        f"bpl.server_timestamp BETWEEN TIMESTAMP '{start_timestamp}' AND TIMESTAMP '{end_timestamp}'"
+        "bpl.server_timestamp BETWEEN CAST(? AS TIMESTAMP) AND CAST(? AS TIMESTAMP)"
     ]
+    params = [sql_string_literal(start_timestamp), sql_string_literal(end_timestamp)]
 
     if country:
-        where_clauses.append(f"context.country = '{country}'")
+        where_clauses.append("context.country = ?")
+        params.append(sql_string_literal(country))
     if app:
-        where_clauses.append(f"context.app = '{app}'")
+        where_clauses.append("context.app = ?")
+        params.append(sql_string_literal(app))
 
     where_clause = " AND ".join(where_clauses)
 
-    query = f"""
+    query_template = f"""
         SELECT
             bid_id,
-            CAST(bpl.server_timestamp AS TIMESTAMP) AS server_timestamp,
+            bpl.server_timestamp,
             context.country,
             context.app,
             mediation,
-            JSON_FORMAT(CAST(win_proba_curve AS JSON)) AS win_proba_curve,
+            {{win_proba_curve}},
             response.bid,
             response.promoted_entity,
             optimizer.naive_base_reward AS reward
         FROM bid_pricer_log bpl
         WHERE {where_clause}
         AND win_proba_curve.bid_samples IS NOT NULL
-        LIMIT {limit}
+        LIMIT {int(limit)}
     """
 
-    df = wr.athena.read_sql_query(
-        query,
-        boto3_session=session,
-        workgroup=WORKGROUP,
-        database=DEFAULT_DATABASE,
-        ctas_approach=False,
-        unload_approach=False,
-        s3_output=f"{S3_OUTPUT_BUCKET}/{uuid4()}",
+    # With UNLOAD the struct comes back typed from Parquet and is serialized
+    # locally; regular CSV results would render it as Trino's ROW text, so
+    # that path keeps formatting it as JSON on Athena's side
+    df = await asyncio.to_thread(
+        read_sql_query,
+        query_template.format(win_proba_curve="win_proba_curve"),
+        DEFAULT_DATABASE,
+        max_rows=100,
+        params=params,
+        regular_query=query_template.format(
+            win_proba_curve="JSON_FORMAT(CAST(win_proba_curve AS JSON)) AS win_proba_curve"
+        ),
     )
 
-    result = f"**Bid Pricer Log Sample** ({len(df)} rows)\n\n"
-    result += f"Time range: {start_timestamp} to {end_timestamp}\n"
+    if "win_proba_curve" in df:
+        df["win_proba_curve"] = df["win_proba_curve"].map(to_json)
+
+    parts = [
+        f"**Bid Pricer Log Sample** ({format_row_count(df, 100)})\n\n",
+        f"Time range: {start_timestamp} to {end_timestamp}\n",
+    ]
     if country:
-        result += f"Country: {country}\n"
+        parts.append(f"Country: {country}\n")
     if app:
-        result += f"App: {app}\n"
-    result += "\n"
-    result += dataframe_to_markdown(df, max_rows=100)
+        parts.append(f"App: {app}\n")
+    parts.append("\n")
+    parts.append(dataframe_to_markdown(df, max_rows=100))
+
+    return [TextContent(type="text", text="".join(parts))]
+
 
-    return [TextContent(type="text", text=result)]
+# Tool name -> handler, used by call_tool
+_HANDLERS = {
+    "athena_query": handle_athena_query,
+    "athena_list_databases": handle_list_databases,
+    "athena_list_tables": handle_list_tables,
+    "athena_describe_table": handle_describe_table,
+    "athena_sample_query": handle_sample_query,
+}
 
 
 # =============================================================================
@@ -354,5 +664,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
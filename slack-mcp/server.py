@@ -6,11 +6,16 @@ An MCP server that provides tools for interacting with Slack.
 Requires a Slack Bot Token with appropriate scopes.
 """
 
+import asyncio
 import os
+import re
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
-from slack_sdk import WebClient
+import aiohttp
+from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -25,6 +30,13 @@ SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 SLACK_CHANNEL_ALLOWLIST = os.environ.get("SLACK_CHANNEL_ALLOWLIST", "")
 # Maximum messages to retrieve per request
 MAX_MESSAGES = int(os.environ.get("SLACK_MAX_MESSAGES", "100"))
+# Seconds before cached channel name -> ID lookups and channel info are refreshed
+CHANNEL_CACHE_TTL = int(os.environ.get("SLACK_CHANNEL_CACHE_TTL", "600"))
+# Seconds before the workspace user directory snapshot is refreshed
+USER_CACHE_TTL = int(os.environ.get("SLACK_USER_CACHE_TTL", "600"))
+
+# Shape of a channel, private group or DM ID (e.g. C1234567890)
+CHANNEL_ID_PATTERN = re.compile(r"^[CGD][A-Z0-9]{8,}$")
 
 # =============================================================================
 # Server Setup
@@ -32,30 +44,48 @@ MAX_MESSAGES = int(os.environ.get("SLACK_MAX_MESSAGES", "100"))
 
 server = Server("slack-mcp")
 
+# Channel lookups are cached in-process; entries are dropped on channel_not_found
+_CHANNEL_NAME_TO_ID: dict[str, str] = {}
+_CHANNEL_CACHE_TS: float = 0.0
+# Channel ID -> (fetched at, conversations.info result), expired after CHANNEL_CACHE_TTL
+_CHANNEL_INFO_CACHE: dict[str, tuple[float, dict]] = {}
+
+# User ID -> display name, filled from a single users.list snapshot
+_USER_CACHE: dict[str, str] = {}
+_USER_CACHE_FETCHED_AT: float = 0.0
 
-def get_slack_client() -> WebClient:
-    """Create a Slack WebClient with the configured bot token."""
+
+@lru_cache(maxsize=1)
+def get_slack_client() -> AsyncWebClient:
+    """Return the shared Slack AsyncWebClient for the configured bot token."""
     if not SLACK_BOT_TOKEN:
         raise ValueError(
             "SLACK_BOT_TOKEN environment variable is required. "
             "Create a Slack App and add the Bot Token."
         )
-    return WebClient(token=SLACK_BOT_TOKEN)
+    # One aiohttp session for the whole process keeps connections alive
+    # between API calls instead of doing a TLS handshake per request
+    return AsyncWebClient(token=SLACK_BOT_TOKEN, session=aiohttp.ClientSession())
+
 
+def parse_allowlist(value: str) -> frozenset[str]:
+    """Parse a comma-separated channel allowlist."""
+    return frozenset(ch.strip() for ch in value.split(",") if ch.strip())
 
-def get_allowed_channels() -> set[str]:
-    """Parse the channel allowlist from environment variable."""
-    if not SLACK_CHANNEL_ALLOWLIST:
-        return set()  # Empty set means all channels are allowed
-    return {ch.strip() for ch in SLACK_CHANNEL_ALLOWLIST.split(",") if ch.strip()}
+
+# Parsed once at import; empty set means all channels are allowed
+_ALLOWED: frozenset[str] = parse_allowlist(SLACK_CHANNEL_ALLOWLIST)
+_ALLOWED_HAS_NAMES: bool = any(not CHANNEL_ID_PATTERN.match(ch) for ch in _ALLOWED)
 
 
 def is_channel_allowed(channel_id: str, channel_name: str) -> bool:
     """Check if a channel is in the allowlist (or if allowlist is empty)."""
-    allowed = get_allowed_channels()
-    if not allowed:
-        return True  # No allowlist = all channels allowed
-    return channel_id in allowed or channel_name in allowed
+    return not _ALLOWED or channel_id in _ALLOWED or channel_name in _ALLOWED
+
+
+def channel_name_needed(channel_id: str) -> bool:
+    """Check whether the allowlist decision for a channel ID depends on its name."""
+    return _ALLOWED_HAS_NAMES and channel_id not in _ALLOWED
 
 
 def format_timestamp(ts: str) -> str:
@@ -71,62 +101,60 @@ def format_timestamp(ts: str) -> str:
 # Tool Definitions
 # =============================================================================
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available Slack tools."""
-    return [
-        Tool(
-            name="slack_list_channels",
-            description="""List accessible Slack channels.
+# Built once at import; clients re-request the tool list on every reconnect
+_TOOLS: list[Tool] = [
+    Tool(
+        name="slack_list_channels",
+        description="""List accessible Slack channels.
 
 Returns a list of channels the bot has access to. If a channel allowlist is
 configured, only those channels will be returned.
 
 Use this to discover available channels before reading or sending messages.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "include_private": {
-                        "type": "boolean",
-                        "description": "Include private channels the bot is a member of (default: false)",
-                        "default": False
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of channels to return (default: 100)",
-                        "default": 100
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "include_private": {
+                    "type": "boolean",
+                    "description": "Include private channels the bot is a member of (default: false)",
+                    "default": False
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of channels to return (default: 100)",
+                    "default": 100
                 }
             }
-        ),
-        Tool(
-            name="slack_read_messages",
-            description="""Read recent messages from a Slack channel.
+        }
+    ),
+    Tool(
+        name="slack_read_messages",
+        description="""Read recent messages from a Slack channel.
 
 Returns the most recent messages from the specified channel. Messages include
 sender information, timestamp, and content.
 
 Note: Only works for channels the bot has been added to and that are in the
 allowlist (if configured).""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "channel": {
-                        "type": "string",
-                        "description": "Channel ID (e.g., 'C1234567890') or name (e.g., 'general')"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": f"Number of messages to retrieve (default: 20, max: {MAX_MESSAGES})",
-                        "default": 20
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel": {
+                    "type": "string",
+                    "description": "Channel ID (e.g., 'C1234567890') or name (e.g., 'general')"
                 },
-                "required": ["channel"]
-            }
-        ),
-        Tool(
-            name="slack_send_message",
-            description="""Send a message to a Slack channel.
+                "limit": {
+                    "type": "integer",
+                    "description": f"Number of messages to retrieve (default: 20, max: {MAX_MESSAGES})",
+                    "default": 20
+                }
+            },
+            "required": ["channel"]
+        }
+    ),
+    Tool(
+        name="slack_send_message",
+        description="""Send a message to a Slack channel.
 
 Posts a message to the specified channel. Supports basic Slack formatting
 (bold, italic, links, etc.).
@@ -135,66 +163,68 @@ Note: Only works for channels the bot has been added to and that are in the
 allowlist (if configured).
 
 IMPORTANT: Use this tool responsibly. Messages are sent as the bot user.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "channel": {
-                        "type": "string",
-                        "description": "Channel ID (e.g., 'C1234567890') or name (e.g., 'general')"
-                    },
-                    "message": {
-                        "type": "string",
-                        "description": "The message text to send (supports Slack formatting)"
-                    },
-                    "thread_ts": {
-                        "type": "string",
-                        "description": "Optional: Thread timestamp to reply in a thread"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel": {
+                    "type": "string",
+                    "description": "Channel ID (e.g., 'C1234567890') or name (e.g., 'general')"
                 },
-                "required": ["channel", "message"]
-            }
-        ),
-        Tool(
-            name="slack_delete_message",
-            description="""Delete a message from a Slack channel.
+                "message": {
+                    "type": "string",
+                    "description": "The message text to send (supports Slack formatting)"
+                },
+                "thread_ts": {
+                    "type": "string",
+                    "description": "Optional: Thread timestamp to reply in a thread"
+                }
+            },
+            "required": ["channel", "message"]
+        }
+    ),
+    Tool(
+        name="slack_delete_message",
+        description="""Delete a message from a Slack channel.
 
 Deletes a message using its timestamp. The bot can only delete messages it sent,
 unless the bot has admin permissions.
 
 Note: Use slack_read_messages to get message timestamps (ts field).""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "channel": {
-                        "type": "string",
-                        "description": "Channel ID (e.g., 'C1234567890') or name (e.g., 'general')"
-                    },
-                    "ts": {
-                        "type": "string",
-                        "description": "The timestamp of the message to delete (from the ts field)"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel": {
+                    "type": "string",
+                    "description": "Channel ID (e.g., 'C1234567890') or name (e.g., 'general')"
                 },
-                "required": ["channel", "ts"]
-            }
-        )
-    ]
+                "ts": {
+                    "type": "string",
+                    "description": "The timestamp of the message to delete (from the ts field)"
+                }
+            },
+            "required": ["channel", "ts"]
+        }
+    )
+]
+
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available Slack tools."""
+    return _TOOLS
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
     try:
-        if name == "slack_list_channels":
-            return await handle_list_channels(arguments)
-        elif name == "slack_read_messages":
-            return await handle_read_messages(arguments)
-        elif name == "slack_send_message":
-            return await handle_send_message(arguments)
-        elif name == "slack_delete_message":
-            return await handle_delete_message(arguments)
-        else:
+        handler = _HANDLERS.get(name)
+        if handler is None:
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        return await handler(arguments)
     except SlackApiError as e:
+        if e.response["error"] == "channel_not_found":
+            invalidate_channel_cache()
         error_msg = f"Slack API error: {e.response['error']}"
         if e.response.get("needed"):
             error_msg += f"\nMissing scope: {e.response['needed']}"
@@ -210,7 +240,6 @@ async def handle_list_channels(arguments: dict[str, Any]) -> list[TextContent]:
     limit = min(arguments.get("limit", 100), 1000)
 
     client = get_slack_client()
-    allowed = get_allowed_channels()
 
     # Get public channels
     types = "public_channel"
@@ -221,9 +250,9 @@ async def handle_list_channels(arguments: dict[str, Any]) -> list[TextContent]:
     channels = []
     cursor = None
     while True:
-        result = client.conversations_list(
+        result = await client.conversations_list(
             types=types,
-            limit=200,  # Fetch in batches of 200
+            limit=1000,  # Slack's maximum page size
             cursor=cursor,
             exclude_archived=True
         )
@@ -233,7 +262,7 @@ async def handle_list_channels(arguments: dict[str, Any]) -> list[TextContent]:
             ch_name = channel["name"]
 
             # Filter by allowlist if configured
-            if allowed and not is_channel_allowed(ch_id, ch_name):
+            if _ALLOWED and not is_channel_allowed(ch_id, ch_name):
                 continue
 
             channels.append({
@@ -256,19 +285,21 @@ async def handle_list_channels(arguments: dict[str, Any]) -> list[TextContent]:
     if not channels:
         return [TextContent(type="text", text="No accessible channels found.")]
 
-    output = "**Accessible Slack Channels**\n\n"
-    output += "| ID | Name | Private | Bot Member | Members |\n"
-    output += "|-----|------|---------|------------|--------|\n"
+    parts = [
+        "**Accessible Slack Channels**\n\n",
+        "| ID | Name | Private | Bot Member | Members |\n",
+        "|-----|------|---------|------------|--------|\n",
+    ]
 
     for ch in channels:
         private_icon = "Yes" if ch["is_private"] else "No"
         member_icon = "Yes" if ch["is_member"] else "No"
-        output += f"| {ch['id']} | #{ch['name']} | {private_icon} | {member_icon} | {ch['num_members']} |\n"
+        parts.append(f"| {ch['id']} | #{ch['name']} | {private_icon} | {member_icon} | {ch['num_members']} |\n")
 
-    if allowed:
-        output += f"\n*Filtered by allowlist: {', '.join(allowed)}*"
+    if _ALLOWED:
+        parts.append(f"\n*Filtered by allowlist: {', '.join(_ALLOWED)}*")
 
-    return [TextContent(type="text", text=output)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 async def handle_read_messages(arguments: dict[str, Any]) -> list[TextContent]:
@@ -279,43 +310,37 @@ async def handle_read_messages(arguments: dict[str, Any]) -> list[TextContent]:
     client = get_slack_client()
 
     # Resolve channel name to ID if needed
-    channel_id = await resolve_channel_id(client, channel)
-    channel_info = await get_channel_info(client, channel_id)
+    channel_id, channel_name = await resolve_channel_id(client, channel)
+    if channel_name is None and channel_name_needed(channel_id):
+        channel_name = (await get_channel_info(client, channel_id)).get("name")
 
     # Check allowlist
-    if not is_channel_allowed(channel_id, channel_info.get("name", "")):
+    if not is_channel_allowed(channel_id, channel_name or ""):
         return [TextContent(
             type="text",
             text=f"Error: Channel '{channel}' is not in the allowed channels list."
         )]
 
     # Get messages
-    result = client.conversations_history(
+    result = await client.conversations_history(
         channel=channel_id,
         limit=limit
     )
 
     messages = result.get("messages", [])
     if not messages:
-        return [TextContent(type="text", text=f"No messages found in #{channel_info.get('name', channel)}.")]
+        return [TextContent(type="text", text=f"No messages found in #{channel_name or channel}.")]
 
     # Get user info for display names
-    user_cache = {}
+    user_cache = await get_user_names(
+        client, {msg["user"] for msg in messages if msg.get("user")}
+    )
 
-    output = f"**Messages from #{channel_info.get('name', channel)}** ({len(messages)} messages)\n\n"
+    parts = [f"**Messages from #{channel_name or channel}** ({len(messages)} messages)\n\n"]
 
     # Messages are in reverse chronological order, reverse for natural reading
     for msg in reversed(messages):
         user_id = msg.get("user", "Unknown")
-
-        # Cache user lookups
-        if user_id not in user_cache and user_id != "Unknown":
-            try:
-                user_info = client.users_info(user=user_id)
-                user_cache[user_id] = user_info["user"].get("real_name", user_info["user"].get("name", user_id))
-            except SlackApiError:
-                user_cache[user_id] = user_id
-
         username = user_cache.get(user_id, user_id)
         raw_ts = msg.get("ts", "")
         timestamp = format_timestamp(raw_ts)
@@ -325,9 +350,9 @@ async def handle_read_messages(arguments: dict[str, Any]) -> list[TextContent]:
         if msg.get("bot_id"):
             username = msg.get("username", "Bot")
 
-        output += f"**{username}** ({timestamp}) [ts: {raw_ts}]:\n{text}\n\n"
+        parts.append(f"**{username}** ({timestamp}) [ts: {raw_ts}]:\n{text}\n\n")
 
-    return [TextContent(type="text", text=output)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 async def handle_send_message(arguments: dict[str, Any]) -> list[TextContent]:
@@ -339,11 +364,12 @@ async def handle_send_message(arguments: dict[str, Any]) -> list[TextContent]:
     client = get_slack_client()
 
     # Resolve channel name to ID if needed
-    channel_id = await resolve_channel_id(client, channel)
-    channel_info = await get_channel_info(client, channel_id)
+    channel_id, channel_name = await resolve_channel_id(client, channel)
+    if channel_name is None and channel_name_needed(channel_id):
+        channel_name = (await get_channel_info(client, channel_id)).get("name")
 
     # Check allowlist
-    if not is_channel_allowed(channel_id, channel_info.get("name", "")):
+    if not is_channel_allowed(channel_id, channel_name or ""):
         return [TextContent(
             type="text",
             text=f"Error: Channel '{channel}' is not in the allowed channels list."
@@ -357,10 +383,10 @@ async def handle_send_message(arguments: dict[str, Any]) -> list[TextContent]:
     if thread_ts:
         kwargs["thread_ts"] = thread_ts
 
-    result = client.chat_postMessage(**kwargs)
+    result = await client.chat_postMessage(**kwargs)
 
     output = f"**Message sent successfully**\n\n"
-    output += f"- Channel: #{channel_info.get('name', channel)}\n"
+    output += f"- Channel: #{channel_name or channel}\n"
     output += f"- Timestamp: {result['ts']}\n"
     if thread_ts:
         output += f"- Thread: {thread_ts}\n"
@@ -377,63 +403,156 @@ async def handle_delete_message(arguments: dict[str, Any]) -> list[TextContent]:
     client = get_slack_client()
 
     # Resolve channel name to ID if needed
-    channel_id = await resolve_channel_id(client, channel)
-    channel_info = await get_channel_info(client, channel_id)
+    channel_id, channel_name = await resolve_channel_id(client, channel)
+    if channel_name is None and channel_name_needed(channel_id):
+        channel_name = (await get_channel_info(client, channel_id)).get("name")
 
     # Check allowlist
-    if not is_channel_allowed(channel_id, channel_info.get("name", "")):
+    if not is_channel_allowed(channel_id, channel_name or ""):
         return [TextContent(
             type="text",
             text=f"Error: Channel '{channel}' is not in the allowed channels list."
         )]
 
     # Delete message
-    result = client.chat_delete(channel=channel_id, ts=ts)
+    result = await client.chat_delete(channel=channel_id, ts=ts)
 
     output = f"**Message deleted successfully**\n\n"
-    output += f"- Channel: #{channel_info.get('name', channel)}\n"
+    output += f"- Channel: #{channel_name or channel}\n"
     output += f"- Deleted timestamp: {ts}"
 
     return [TextContent(type="text", text=output)]
 
 
-async def resolve_channel_id(client: WebClient, channel: str) -> str:
-    """Resolve a channel name to its ID, or return the ID if already an ID."""
-    # If it looks like an ID (starts with C, G, or D), return as-is
-    if channel.startswith(("C", "G", "D")) and len(channel) >= 9:
-        return channel
+async def resolve_channel_id(
+    client: AsyncWebClient, channel: str
+) -> tuple[str, str | None]:
+    """Resolve a channel name to its ID, or return the ID if already an ID.
+
+    Returns the ID together with the channel name, or None as the name when an
+    ID was given and the name has not been looked up yet.
+    """
+    global _CHANNEL_CACHE_TS
+
+    # If it looks like an ID, return as-is without an API call
+    if CHANNEL_ID_PATTERN.match(channel):
+        return channel, _cached_channel_info(channel).get("name")
 
     # Remove # prefix if present
     channel_name = channel.lstrip("#")
 
-    # Search for channel by name, handling pagination
-    cursor = None
-    while True:
-        result = client.conversations_list(
-            types="public_channel,private_channel",
-            limit=200,
-            cursor=cursor,
-            exclude_archived=True
-        )
-        for ch in result["channels"]:
-            if ch["name"] == channel_name:
-                return ch["id"]
+    if time.monotonic() - _CHANNEL_CACHE_TS > CHANNEL_CACHE_TTL:
+        _CHANNEL_NAME_TO_ID.clear()
+
+    if channel_name not in _CHANNEL_NAME_TO_ID:
+        # Only channels the bot is a member of, which is far fewer than the
+        # whole workspace and is all the bot can read from or post to anyway
+        cursor = None
+        while True:
+            result = await client.users_conversations(
+                types="public_channel,private_channel",
+                limit=1000,
+                cursor=cursor,
+                exclude_archived=True
+            )
+            for ch in result["channels"]:
+                _CHANNEL_NAME_TO_ID[ch["name"]] = ch["id"]
+
+            # Check for more pages
+            cursor = result.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                break
+        _CHANNEL_CACHE_TS = time.monotonic()
 
-        # Check for more pages
-        cursor = result.get("response_metadata", {}).get("next_cursor")
-        if not cursor:
-            break
+    if channel_name in _CHANNEL_NAME_TO_ID:
+        return _CHANNEL_NAME_TO_ID[channel_name], channel_name
 
     raise ValueError(f"Channel '{channel}' not found. Use channel ID or exact name.")
 
 
-async def get_channel_info(client: WebClient, channel_id: str) -> dict:
+def _cached_channel_info(channel_id: str) -> dict:
+    """Return cached channel info, or an empty dict if missing or expired."""
+    entry = _CHANNEL_INFO_CACHE.get(channel_id)
+    if entry is None:
+        return {}
+    fetched_at, info = entry
+    if time.monotonic() - fetched_at > CHANNEL_CACHE_TTL:
+        # Expired so a rename (e.g. out of the allowlist) is picked up
+        del _CHANNEL_INFO_CACHE[channel_id]
+        return {}
+    return info
+
+
+async def get_channel_info(client: AsyncWebClient, channel_id: str) -> dict:
     """Get information about a channel."""
+    info = _cached_channel_info(channel_id)
+    if info:
+        return info
     try:
-        result = client.conversations_info(channel=channel_id)
-        return result["channel"]
+        result = await client.conversations_info(channel=channel_id)
     except SlackApiError:
         return {"id": channel_id}
+    _CHANNEL_INFO_CACHE[channel_id] = (time.monotonic(), result["channel"])
+    return result["channel"]
+
+
+def _user_display_name(user: dict) -> str:
+    """Pick the most readable name available for a Slack user object."""
+    return user.get("real_name") or user.get("name") or user["id"]
+
+
+async def get_user_names(client: AsyncWebClient, user_ids: set[str]) -> dict[str, str]:
+    """Map user IDs to display names using a cached users.list snapshot."""
+    global _USER_CACHE_FETCHED_AT
+
+    if user_ids and time.monotonic() - _USER_CACHE_FETCHED_AT > USER_CACHE_TTL:
+        # Build the snapshot aside so a failed page keeps the previous one intact
+        snapshot = {}
+        cursor = None
+        try:
+            while True:
+                result = await client.users_list(limit=1000, cursor=cursor)
+                for user in result["members"]:
+                    snapshot[user["id"]] = _user_display_name(user)
+
+                # Check for more pages
+                cursor = result.get("response_metadata", {}).get("next_cursor")
+                if not cursor:
+                    break
+        except SlackApiError:
+            # e.g. missing users:read or rate limited; fall back to users.info below
+            pass
+        else:
+            _USER_CACHE.clear()
+            _USER_CACHE.update(snapshot)
+            _USER_CACHE_FETCHED_AT = time.monotonic()
+
+    # Users missing from the directory (e.g. from other workspaces) are looked up one by one
+    for user_id in user_ids - _USER_CACHE.keys():
+        try:
+            user_info = await client.users_info(user=user_id)
+            _USER_CACHE[user_id] = _user_display_name(user_info["user"])
+        except SlackApiError:
+            _USER_CACHE[user_id] = user_id
+
+    return {user_id: _USER_CACHE[user_id] for user_id in user_ids}
+
+
+def invalidate_channel_cache() -> None:
+    """Forget cached channel lookups, e.g. after a channel was renamed or deleted."""
+    global _CHANNEL_CACHE_TS
+    _CHANNEL_NAME_TO_ID.clear()
+    _CHANNEL_INFO_CACHE.clear()
+    _CHANNEL_CACHE_TS = 0.0
+
+
+# Tool name -> handler, used by call_tool
+_HANDLERS = {
+    "slack_list_channels": handle_list_channels,
+    "slack_read_messages": handle_read_messages,
+    "slack_send_message": handle_send_message,
+    "slack_delete_message": handle_delete_message,
+}
 
 
 # =============================================================================
@@ -442,14 +561,17 @@ async def get_channel_info(client: WebClient, channel_id: str) -> dict:
 
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+    finally:
+        if get_slack_client.cache_info().currsize:
+            await get_slack_client().session.close()
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())